@@ -25,12 +25,14 @@
 #     console_gui_main(MyMenu)
 
 
+import concurrent.futures
 import copy
 import curses
 import curses.panel
 import dataclasses
 import logging
 import os
+import queue
 import selectors
 import sys
 import threading
@@ -85,13 +87,19 @@ class CursesStdscrType:
 CURSES_STDSCR: CursesStdscrType = CursesStdscrType()
 
 
-class SelectableThread(threading.Thread):
+class SelectableTask:
+    """A task run by one of the SelectableTaskPool workers.  Completion is signalled by writing to a pipe, so callers can
+       wait on it with a selector.
+    """
     def __init__(self, callable_task):
-        super().__init__(daemon=True)
         self.callable_task: Callable = callable_task
         self.callable_result = None
         self.callable_exception_info_tuple: Optional[Exception] = None
         self.read_pipe_fd, self.write_pipe_fd = os.pipe()
+        self.done_event = threading.Event()
+
+    def is_alive(self) -> bool:
+        return not self.done_event.is_set()
 
     def run(self) -> None:
         if self.callable_task:
@@ -107,14 +115,115 @@ class SelectableThread(threading.Thread):
                 # for l in exception_lines:
                 #     logging.error(l.strip())
 
+        self.done_event.set()
         os.write(self.write_pipe_fd, b'\n')
         os.close(self.write_pipe_fd)
 
 
+class SelectableTaskPool:
+    """A pool of daemon worker threads that run SelectableTask objects, so repeated background tasks (e.g. a run of IMDB
+       fetches) do not each pay for creating and tearing down a thread.  A new worker is started whenever none is idle, so a
+       task the user has given up on (which keeps its worker busy until it finishes) never holds up the tasks after it.  The
+       workers are daemons, so such a task does not hold up exiting the program either.
+    """
+    def __init__(self):
+        self.task_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.num_workers = 0
+        self.num_idle_workers = 0
+        self.lock = threading.Lock()
+
+    def worker_loop(self):
+        while True:
+            selectable_task = self.task_queue.get()
+            selectable_task.run()
+            with self.lock:
+                self.num_idle_workers += 1
+
+    def submit(self, selectable_task: SelectableTask) -> SelectableTask:
+        with self.lock:
+            if self.num_idle_workers:
+                self.num_idle_workers -= 1
+            else:
+                worker = threading.Thread(target=self.worker_loop, name=f'selectable_task_pool_{self.num_workers}', daemon=True)
+                worker.start()
+                self.num_workers += 1
+
+        self.task_queue.put(selectable_task)
+        return selectable_task
+
+
+SELECTABLE_TASK_POOL = SelectableTaskPool()
+
+
+class DaemonThreadPoolExecutor(concurrent.futures.Executor):
+    """Like concurrent.futures.ThreadPoolExecutor (at most max_workers tasks run at once), but the workers are daemon threads,
+       so a task that is still running (e.g. an IMDB fetch) does not hold up exiting the program.
+    """
+    def __init__(self, max_workers: int, thread_name_prefix: str = 'daemon_thread_pool'):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self.work_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.workers: List[threading.Thread] = list()
+        self.is_shutdown = False
+        self.lock = threading.Lock()
+
+    def worker_loop(self):
+        while True:
+            work_item = self.work_queue.get()
+            if work_item is None:
+                return
+
+            future, task, args, kwargs = work_item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = task(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def submit(self, task: Callable, /, *args, **kwargs) -> concurrent.futures.Future:
+        with self.lock:
+            if self.is_shutdown:
+                raise RuntimeError('Cannot submit a task after shutdown')
+
+            future = concurrent.futures.Future()
+            self.work_queue.put((future, task, args, kwargs))
+
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self.worker_loop, name=f'{self.thread_name_prefix}_{len(self.workers)}', daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.lock:
+            self.is_shutdown = True
+
+            if cancel_futures:
+                while True:
+                    try:
+                        work_item = self.work_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if work_item is not None:
+                        work_item[0].cancel()
+
+            for _ in self.workers:
+                self.work_queue.put(None)
+
+        if wait:
+            for worker in self.workers:
+                worker.join()
+
+
 @dataclasses.dataclass
 class ThreadedDialogResult:
     dialog_result: Optional[str] = None
-    selectable_thread: SelectableThread = None
+    selectable_thread: SelectableTask = None
 
 
 class Column:
@@ -161,6 +270,13 @@ class HorizontalLine(Row):
     def __init__(self):
         super(HorizontalLine, self).__init__()
 
+    # All HorizontalLines render the same, so they compare equal
+    def __eq__(self, other):
+        return isinstance(other, HorizontalLine)
+
+    def __hash__(self):
+        return hash(HorizontalLine)
+
 
 class ScrollPanelRunResult:
     """When a ScrollPanel exits (e.g. user presses return or escape), an object of this type is returned.
@@ -931,15 +1047,12 @@ class DialogBox:
 
 
 def show_exception_details_dialog(exc_type, exc_value, exc_traceback):
+    # format_exception() chunks can span several lines
+    exception_chunks = traceback.format_exception(exc_type, exc_value, exc_traceback)
     message_lines = [f'Caught an exception: {exc_value}']
-    exception_lines = traceback.format_exception(exc_type, exc_value, exc_traceback)
-    for exception_line in exception_lines:
-        for line in exception_line.split('\n'):
-            if line.strip():
-                message_lines.append(line)
+    message_lines.extend(line for exception_chunk in exception_chunks for line in exception_chunk.splitlines() if line.strip())
 
-    for line in message_lines:
-        logging.error(line)
+    logging.error('\n'.join(message_lines))
 
     with MessagePanel(message_lines) as message_panel:
         message_panel.run()
@@ -950,8 +1063,7 @@ def run_cancellable_thread(task: Callable, getch_function = None, cancel_keys: L
     if cancel_keys is None:
         cancel_keys = [Keycodes.ESCAPE]
 
-    task_thread = SelectableThread(task)
-    task_thread.start()
+    task_thread = SELECTABLE_TASK_POOL.submit(SelectableTask(task))
 
     # We are not currently reading from the thread, but we probably will need to support that eventually...
     sel = selectors.DefaultSelector()
@@ -1,13 +1,24 @@
+import collections
 import dataclasses
+import functools
+import json
+import logging
 import os
 import re
-from typing import List, Text, Tuple
+import shelve
+import textwrap
+import threading
+import time
+from typing import Any, List, Optional, Text, Tuple
 
 import parsel
 import requests
 
 
-@dataclasses.dataclass
+VIDEO_INFO_WRITE_BUFFER_SIZE = 1 << 20
+
+
+@dataclasses.dataclass(slots=True)
 class VideoFile:
     file_path: Text = ''
     scrubbed_file_name: Text = ''
@@ -21,7 +32,42 @@ class VideoFile:
     is_dirty: bool = False
 
 
-@dataclasses.dataclass
+VIDEO_FILE_FIELD_NAMES = tuple(field.name for field in dataclasses.fields(VideoFile))
+
+
+def video_file_to_dict(video_file: VideoFile) -> dict:
+    return {field_name: getattr(video_file, field_name) for field_name in VIDEO_FILE_FIELD_NAMES}
+
+
+def video_file_from_dict(video_file_dict: dict) -> VideoFile:
+    # Keys that are not VideoFile fields (e.g. from a newer or older version of the file) are ignored
+    return VideoFile(**{field_name: video_file_dict[field_name] for field_name in VIDEO_FILE_FIELD_NAMES if field_name in video_file_dict})
+
+
+def save_video_files(video_file_path: Text, video_files: List[VideoFile]):
+    if not video_files:
+        with open(video_file_path, 'wb') as f:
+            f.write(b'[]')
+        return
+
+    with open(video_file_path, 'wb', buffering=VIDEO_INFO_WRITE_BUFFER_SIZE) as f:
+        # Same output as json.dumps(video_files, indent=4), written a record at a time
+        encode_json = json.JSONEncoder(indent=4).encode
+        f.write(b'[\n')
+        for i, video_file in enumerate(video_files):
+            if i > 0:
+                f.write(b',\n')
+            json_str = encode_json(video_file_to_dict(video_file))
+            f.write(textwrap.indent(json_str, '    ').encode('utf8'))
+        f.write(b'\n]')
+
+
+def load_video_files(video_file_path: Text) -> List[VideoFile]:
+    with open(video_file_path, 'rb') as f:
+        return [video_file_from_dict(video_file_dict) for video_file_dict in json.loads(f.read())]
+
+
+@dataclasses.dataclass(slots=True)
 class IMDBInfo:
     imdb_tt: Text = ''
     imdb_name: Text = ''
@@ -29,12 +75,116 @@ class IMDBInfo:
     imdb_rating: Text = ''
     imdb_genres: List[Text] = None
     imdb_plot: Text = ''
+    detail_loaded: bool = False
+
+
+class IMDBCache:
+    """A small persistent cache of parsed IMDB results, so looking up the same search/title again (even in a later session)
+       does not have to go back to IMDB.  Entries older than ttl_seconds are treated as missing.
+       The most recently used max_memory_entries entries are also kept in memory, so looking them up again does not reopen
+       the shelf.  The lookups run on worker threads, so all access is serialized with a lock.
+    """
+    def __init__(self, cache_path: Text, ttl_seconds: float, max_memory_entries: int = 1024):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.lock = threading.Lock()
+        self.memory_cache: collections.OrderedDict = collections.OrderedDict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def open_shelf(self) -> shelve.Shelf:
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        return shelve.open(self.cache_path)
+
+    def remember(self, key: Text, fetched_at: float, value: Any):
+        self.memory_cache[key] = (fetched_at, value)
+        if len(self.memory_cache) > self.max_memory_entries:
+            self.memory_cache.popitem(last=False)
+
+    def get(self, key: Text) -> Optional[Any]:
+        with self.lock:
+            fetched_at, value = self.memory_cache.pop(key, (0.0, None))
+
+            if value is None:
+                # noinspection PyBroadException
+                try:
+                    with self.open_shelf() as cache_shelf:
+                        fetched_at, value = cache_shelf.get(key, (0.0, None))
+                except Exception:
+                    logging.exception('Could not read IMDB cache %s', self.cache_path)
+
+            if time.time() - fetched_at > self.ttl_seconds:
+                value = None
+
+            if value is None:
+                self.num_misses += 1
+            else:
+                self.num_hits += 1
+                self.remember(key, fetched_at, value)
+
+            logging.debug('IMDB cache %s for %s (%d hits, %d misses)', 'miss' if value is None else 'hit', key, self.num_hits, self.num_misses)
+
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.memory_cache.clear()
+
+            # noinspection PyBroadException
+            try:
+                with self.open_shelf() as cache_shelf:
+                    cache_shelf.clear()
+            except Exception:
+                logging.exception('Could not clear IMDB cache %s', self.cache_path)
+
+    def put(self, key: Text, value: Any):
+        fetched_at = time.time()
+
+        with self.lock:
+            self.remember(key, fetched_at, value)
+
+            # noinspection PyBroadException
+            try:
+                with self.open_shelf() as cache_shelf:
+                    cache_shelf[key] = (fetched_at, value)
+            except Exception:
+                logging.exception('Could not write IMDB cache %s', self.cache_path)
+
+
+# The file name is versioned since entries pickled before IMDBInfo used __slots__ do not unpickle correctly into it
+IMDB_CACHE = IMDBCache(os.path.expanduser('~/.cache/imdb_scraper/imdb_cache_v2'), ttl_seconds=7 * 24 * 60 * 60)
+
+IMDB_SESSION = requests.Session()
+IMDB_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def imdb_search_cache_key(video_name: Text, year: Text = None) -> Text:
+    return f'search:{video_name}:{year or ""}'
+
+
+def imdb_detail_cache_key(imdb_tt: Text) -> Text:
+    return f'detail:{imdb_tt}'
+
+
+def get_cached_imdb_search_results(video_name: Text, year: Text = None) -> Optional[List[IMDBInfo]]:
+    # Callers replace entries in the search results they get back, so the cache holds a tuple and hands out list copies
+    imdb_search_results = IMDB_CACHE.get(imdb_search_cache_key(video_name, year))
+    return list(imdb_search_results) if imdb_search_results else None
 
 
 def get_parse_imdb_search_results(video_name: Text, year: Text = None) -> List[IMDBInfo]:
+    return get_cached_imdb_search_results(video_name, year) or fetch_parse_imdb_search_results(video_name, year)
+
+
+def fetch_parse_imdb_search_results(video_name: Text, year: Text = None) -> List[IMDBInfo]:
     imdb_response_text = get_imdb_search_results(video_name, year)
+    imdb_search_results = parse_imdb_search_results(imdb_response_text)
+
+    if imdb_search_results:
+        IMDB_CACHE.put(imdb_search_cache_key(video_name, year), tuple(imdb_search_results))
 
-    return parse_imdb_search_results(imdb_response_text)
+    return imdb_search_results
 
 
 def get_imdb_search_results(video_name: Text, year: Text = None) -> Text:
@@ -49,7 +199,7 @@ def get_imdb_search_results(video_name: Text, year: Text = None) -> Text:
     if year:
         url += f'+{year}'
 
-    imdb_response = requests.get(url, headers=headers, timeout=(5.0, 25.0))
+    imdb_response = IMDB_SESSION.get(url, headers=headers, timeout=(5.0, 25.0))
 
     if imdb_response.status_code != 200:
         raise Exception(f'HTTP {imdb_response.status_code} while fetching search results for {video_name}')
@@ -63,10 +213,22 @@ def get_imdb_search_results(video_name: Text, year: Text = None) -> Text:
     return imdb_response_text
 
 
+def get_cached_imdb_tt_info(imdb_tt: Text) -> Optional[IMDBInfo]:
+    return IMDB_CACHE.get(imdb_detail_cache_key(imdb_tt))
+
+
 def get_parse_imdb_tt_info(imdb_tt: Text) -> IMDBInfo:
+    return get_cached_imdb_tt_info(imdb_tt) or fetch_parse_imdb_tt_info(imdb_tt)
+
+
+def fetch_parse_imdb_tt_info(imdb_tt: Text) -> IMDBInfo:
     imdb_response_text = get_imdb_tt_info(imdb_tt)
+    imdb_info = parse_imdb_tt_results(imdb_response_text, imdb_tt)
+
+    if imdb_info.imdb_name:
+        IMDB_CACHE.put(imdb_detail_cache_key(imdb_tt), imdb_info)
 
-    return parse_imdb_tt_results(imdb_response_text, imdb_tt)
+    return imdb_info
 
 
 def get_imdb_tt_info(imdb_tt: Text) -> Text:
@@ -78,7 +240,7 @@ def get_imdb_tt_info(imdb_tt: Text) -> Text:
     imdb_tt = imdb_tt
     url = f'https://www.imdb.com/title/{imdb_tt}/'
 
-    imdb_response = requests.get(url, headers=headers, timeout=(5.0, 25.0))
+    imdb_response = IMDB_SESSION.get(url, headers=headers, timeout=(5.0, 25.0))
     imdb_response_text = imdb_response.text
 
     # For testing, save a copy of the file
@@ -88,6 +250,25 @@ def get_imdb_tt_info(imdb_tt: Text) -> Text:
     return imdb_response_text
 
 
+def clean_imdb_year(imdb_year: Text) -> Text:
+    # IMDB year labels look like "2019" or "2019–2021"; keep the leading 4 ASCII digits or nothing at all
+    imdb_year = (imdb_year or '')[:4]
+    if len(imdb_year) == 4 and imdb_year.isascii() and imdb_year.isdigit():
+        return imdb_year
+    return ''
+
+
+def imdb_tt_from_url(imdb_tt_url: Text) -> Text:
+    # The href looks like "/title/tt1234567/?ref_=..." (the slash is not always there), so take "tt" and the digits after it
+    if not imdb_tt_url.startswith('/title/tt'):
+        return ''
+
+    end = 9
+    while end < len(imdb_tt_url) and imdb_tt_url[end].isdigit():
+        end += 1
+    return imdb_tt_url[7:end] if end > 9 else ''
+
+
 def parse_imdb_search_results(imdb_response_text: Text) -> List[IMDBInfo]:
     match_video_files = list()
     imdb_response_selector = parsel.Selector(text=imdb_response_text)
@@ -96,11 +277,9 @@ def parse_imdb_search_results(imdb_response_text: Text) -> List[IMDBInfo]:
         imdb_title = search_result_selector.xpath(".//div/div/a/text()").get() or ''
         imdb_year = search_result_selector.xpath(".//div/div/ul[1]/li/label/text()").get() or ''
         imdb_tt_url = search_result_selector.xpath(".//div/div/a/@href").get() or ''
-        imdb_tt = re.match(r'/title/(tt\d+).*', imdb_tt_url).group(1) or ''
 
-        imdb_year = imdb_year[:4]
-        if not imdb_year.isdigit():
-            imdb_year = ''
+        imdb_tt = imdb_tt_from_url(imdb_tt_url)
+        imdb_year = clean_imdb_year(imdb_year)
 
         match_video_file = IMDBInfo(imdb_tt=imdb_tt, imdb_name=imdb_title, imdb_year=imdb_year)
         match_video_files.append(match_video_file)
@@ -130,18 +309,21 @@ def parse_imdb_tt_results(imdb_response_text: Text, imdb_tt: Text) -> IMDBInfo:
         imdb_year = imdb_response_selector.xpath("/html/body/div[2]/main/div/section[1]/section/div[3]/section/section/div[2]/div[1]/div/ul/li//a/text()").get()
     if not imdb_year:
         imdb_year = imdb_response_selector.xpath("/html/body/div[2]/main/div/section[1]/section/div[3]/section/section/div[2]/div[1]/ul/li[1]/a/text()").get()
-    if not imdb_year:
-        imdb_year = ''
-    imdb_year = imdb_year[:4]
-    if not imdb_year.isdigit():
-        imdb_year = ''
+    imdb_year = clean_imdb_year(imdb_year)
 
     # foo = imdb_response_selector.xpath("/html/body/div[2]/main/div/section[1]/section/div[3]/section/section/div[2]/div[1]/div/ul/li[1]/a/text()").get()
     # foo = imdb_response_selector.xpath("/html/body/div[2]/main/div/section[1]/section/div[3]/section/section/div[2]/div[1]/div/ul/li[2]/a/text()").get()
 
-    return IMDBInfo(imdb_tt=imdb_tt, imdb_rating=imdb_rating, imdb_genres=imdb_genres, imdb_name=imdb_name, imdb_plot=imdb_plot, imdb_year=imdb_year)
+    return IMDBInfo(imdb_tt=imdb_tt, imdb_rating=imdb_rating, imdb_genres=imdb_genres, imdb_name=imdb_name, imdb_plot=imdb_plot, imdb_year=imdb_year, detail_loaded=True)
+
 
+@functools.lru_cache(maxsize=16)
+def parse_filename_metadata_tokens(filename_metadata_tokens: Text) -> frozenset:
+    return frozenset(token.lower().strip() for token in filename_metadata_tokens.split(','))
 
+
+# Rescanning a folder mostly sees the same file names again, so remember the scrubbed results
+@functools.lru_cache(maxsize=4096)
 def scrub_video_file_name(file_name: Text, filename_metadata_tokens: Text) -> Tuple[Text, Text]:
     year = ''
 
@@ -152,14 +334,14 @@ def scrub_video_file_name(file_name: Text, filename_metadata_tokens: Text) -> Tu
         scrubbed_file_name_list = file_name.replace('.', ' ').split()
 
     else:
-        metadata_token_list = [token.lower().strip() for token in filename_metadata_tokens.split(',')]
+        metadata_token_set = parse_filename_metadata_tokens(filename_metadata_tokens)
         file_name_parts = file_name.replace('.', ' ').split()
         scrubbed_file_name_list = list()
 
         for file_name_part in file_name_parts:
             file_name_part = file_name_part.lower()
 
-            if file_name_part in metadata_token_list:
+            if file_name_part in metadata_token_set:
                 break
             scrubbed_file_name_list.append(file_name_part)
 
@@ -174,30 +356,58 @@ def scrub_video_file_name(file_name: Text, filename_metadata_tokens: Text) -> Tu
     return scrubbed_file_name, year
 
 
+def iter_folder_files(folder_path: Text):
+    """Yield a DirEntry for every file under folder_path, in the same order os.walk() would list them (a folder's own
+       files, then each of its sub-folders).  As with os.walk(), anything that is not a folder counts as a file (including
+       broken symlinks), symlinked folders are not followed and unreadable folders are skipped.  DirEntry carries the name,
+       path and file type from the directory listing itself, so no extra stat() or path joining is needed per file.
+    """
+    folder_paths = [folder_path]
+    while folder_paths:
+        try:
+            with os.scandir(folder_paths.pop()) as dir_entries:
+                dir_entries = list(dir_entries)
+        except OSError:
+            continue
+
+        sub_folder_paths = list()
+        for dir_entry in dir_entries:
+            try:
+                is_dir = dir_entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                yield dir_entry
+            elif not dir_entry.is_symlink():
+                sub_folder_paths.append(dir_entry.path)
+
+        # Popped from the end, so push the sub-folders in reverse to walk them in listing order
+        folder_paths.extend(reversed(sub_folder_paths))
+
+
 def scan_folder(folder_path: Text, ignore_extensions: Text = None, filename_metadata_tokens: Text = None) -> List[VideoFile]:
     if ignore_extensions is None:
         ignore_extensions = 'png,jpg,nfo,srt'
     if filename_metadata_tokens is None:
         filename_metadata_tokens = '480p,720p,1080p,bluray,hevc,x265,x264,web,webrip,web-dl,repack,proper,extended,remastered,dvdrip,dvd,hdtv,xvid,hdrip,brrip,dvdscr,pdtv'
 
-    ignore_extensions_list = [ext.lower().strip() for ext in ignore_extensions.split(',')]
+    ignore_extensions_set = {ext.lower().strip() for ext in ignore_extensions.split(',')}
 
     video_files = list()
 
-    for dir_path, dirs, files in os.walk(folder_path):
-        for filename in files:
-            file_path = os.path.join(dir_path, filename)
-            filename_parts = os.path.splitext(filename)
-            filename_no_extension = filename_parts[0]
-            filename_extension = filename_parts[1]
-            if filename_extension.startswith('.'):
-                filename_extension = filename_extension[1:]
-
-            if filename_extension.lower() in ignore_extensions_list:
-                continue
-
-            scrubbed_video_file_name, year = scrub_video_file_name(filename_no_extension, filename_metadata_tokens)
-            video_file = VideoFile(file_path=file_path, scrubbed_file_name=scrubbed_video_file_name, scrubbed_file_year=year)
-            video_files.append(video_file)
+    for dir_entry in iter_folder_files(folder_path):
+        filename_parts = os.path.splitext(dir_entry.name)
+        filename_no_extension = filename_parts[0]
+        filename_extension = filename_parts[1]
+        if filename_extension.startswith('.'):
+            filename_extension = filename_extension[1:]
+
+        if filename_extension.lower() in ignore_extensions_set:
+            continue
+
+        scrubbed_video_file_name, year = scrub_video_file_name(filename_no_extension, filename_metadata_tokens)
+        video_file = VideoFile(file_path=dir_entry.path, scrubbed_file_name=scrubbed_video_file_name, scrubbed_file_year=year)
+        video_files.append(video_file)
 
     return video_files
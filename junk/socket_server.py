@@ -2,8 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import selectors
 import socket
-import select
 import sys
 import time
 
@@ -27,12 +27,13 @@ def main(argv):
         logging.info(f'Listening on socket...')
         server_listen_socket.listen()
 
+        listen_sel = selectors.DefaultSelector()
+        listen_sel.register(server_listen_socket, selectors.EVENT_READ, 'LISTEN')
+        conn_sel = selectors.DefaultSelector()
+
         while True:
-            while True:
-                logging.info(f'Calling select on listen socket...')
-                readable, writeable, exceptable = select.select([server_listen_socket], [server_listen_socket], [], 1.0)
-                if readable or writeable:
-                    break
+            while not listen_sel.select(1.0):
+                logging.info('Calling select on listen socket...')
 
             # logging.info(f'Sleeping before accepting connection...')
             # time.sleep(5)
@@ -44,45 +45,70 @@ def main(argv):
             conn.setblocking(False)
             logging.info(f'Connected by {addr}')
 
+            # Only ask for write readiness while there is something queued to send; a connected socket is
+            # almost always writable, so registering EVENT_WRITE permanently would spin the select loop
+            conn_sel.register(conn, selectors.EVENT_READ, 'SOCKET')
+
             try:
                 logging.info(f'Servicing connection...')
                 with conn:
                     server_msg_count = 0
-                    client_msg_buffer = ''
+                    server_msg_bytes = b''
+                    next_server_msg_time = time.monotonic()
+                    client_msg_buffer = bytearray()
+                    keep_going = True
+
+                    while keep_going:
+                        if not server_msg_bytes and time.monotonic() >= next_server_msg_time:
+                            logging.info(f'Queueing msg #{server_msg_count}')
+                            server_msg_bytes = f'{server_msg_count=}\n'.encode('utf8')
+                            server_msg_count += 1
+                            next_server_msg_time = time.monotonic() + 3.0
+                            conn_sel.modify(conn, selectors.EVENT_READ | selectors.EVENT_WRITE, 'SOCKET')
+
+                        timeout = 5.0 if server_msg_bytes else min(5.0, max(0.0, next_server_msg_time - time.monotonic()))
 
-                    while True:
                         logging.info(f'Calling select...')
-                        readable, writeable, exceptable = select.select([conn], [conn], [], 5.0)
-
-                        if readable:
-                            try:
-                                logging.info(f'Socket is readable; reading data...')
-                                client_bytes = conn.recv(1024)
-
-                                if not client_bytes:
-                                    logging.info(f'Read no data; connection closed; exiting...')
-                                    break
-
-                                client_str = client_bytes.decode('utf8')
-                                client_msg_buffer += client_str
-                                while '\n' in client_msg_buffer:
-                                    linefeed_index = client_msg_buffer.index('\n')
-                                    client_msg = client_msg_buffer[:linefeed_index]
-                                    logging.info(f'Received message: {client_msg}')
-                                    client_msg_buffer = client_msg_buffer[linefeed_index + 1:]
-                            except BlockingIOError:
-                                logging.info(f'Caught BlockingIOError')
-
-                        if writeable:
-                            logging.info(f'Writing msg #{server_msg_count}')
-                            msg_bytes = f'{server_msg_count=}\n'.encode('utf8')
-                            conn.sendall(msg_bytes)
-                            server_msg_count += 1
-                            time.sleep(3.0)
+                        for selector_key, event_mask in conn_sel.select(timeout):
+                            if event_mask & selectors.EVENT_READ:
+                                try:
+                                    logging.info(f'Socket is readable; reading data...')
+                                    client_bytes = conn.recv(1024)
+
+                                    if not client_bytes:
+                                        logging.info(f'Read no data; connection closed; exiting...')
+                                        keep_going = False
+                                        break
+
+                                    # Accumulate raw bytes and only decode complete messages; deleting the consumed prefix
+                                    # of a bytearray is done in place rather than copying the rest of the buffer
+                                    client_msg_buffer += client_bytes
+                                    linefeed_index = client_msg_buffer.find(b'\n')
+                                    while linefeed_index >= 0:
+                                        client_msg = client_msg_buffer[:linefeed_index].decode('utf8')
+                                        logging.info(f'Received message: {client_msg}')
+                                        del client_msg_buffer[:linefeed_index + 1]
+                                        linefeed_index = client_msg_buffer.find(b'\n')
+                                except BlockingIOError:
+                                    logging.info(f'Caught BlockingIOError')
+
+                            if event_mask & selectors.EVENT_WRITE and server_msg_bytes:
+                                logging.info(f'Socket is writeable; writing {len(server_msg_bytes)} bytes...')
+                                try:
+                                    byte_count = conn.send(server_msg_bytes)
+                                    server_msg_bytes = server_msg_bytes[byte_count:]
+                                except BlockingIOError:
+                                    logging.info(f'Caught BlockingIOError')
+
+                                if not server_msg_bytes:
+                                    conn_sel.modify(conn, selectors.EVENT_READ, 'SOCKET')
 
             except BrokenPipeError:
                 logging.info(f'Caught BrokenPipeError; exiting...')
 
+            finally:
+                conn_sel.unregister(conn)
+
 
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s [%(levelname)s] %(funcName)s:%(lineno)d: %(message)s', level=logging.INFO)
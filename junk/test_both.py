@@ -76,7 +76,7 @@ if process_id:
 
     with raw(sys.stdin):
         keep_going = True
-        read_buffer = ''
+        read_buffer = bytearray()
         print('PARENT: Waiting for data')
         while keep_going:
             events = sel.select(0.5)
@@ -88,12 +88,13 @@ if process_id:
                     print(f'PARENT: Read {len(text)} bytes from r_file ({repr(text)})')
                     if not text:
                         keep_going = False
-                    read_buffer += text.decode('ascii')
-                    if '\n' in read_buffer:
-                        newline_i = read_buffer.find('\n')
-                        read_message = read_buffer[:newline_i]
+                    read_buffer.extend(text)
+                    newline_i = read_buffer.find(b'\n')
+                    while newline_i >= 0:
+                        read_message = bytes(read_buffer[:newline_i]).decode('ascii')
                         print(f'PARENT: Read message "{read_message}" from r_file')
-                        read_buffer = read_buffer[newline_i + 1:]
+                        del read_buffer[:newline_i + 1]
+                        newline_i = read_buffer.find(b'\n')
                         # keep_going = False
                 elif selector_key.data == 'STDIN':
                     char = sys.stdin.read(1)
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 import argparse
-import dataclasses
+import concurrent.futures
 import functools
 import json
 import logging
-import math
 import os
 import sys
 import textwrap
@@ -17,14 +16,47 @@ from imdb_scraper import imdb_utils
 import imdb_scraper.imdb_utils
 
 
+# How many video files update_all_video_file_data searches IMDB for ahead of the one being edited
+IMDB_PREFETCH_COUNT = 4
+
+# How many of the editor's search results get their detail pages fetched in the background, ahead of the user picking one
+IMDB_DETAIL_PREFETCH_COUNT = 2
+
+# ScrollingPanel copies the rows it is given, so one HorizontalLine can be shared
+HORIZONTAL_LINE = curses_gui.HorizontalLine()
+
+VIDEO_FILES_HEADER_ROW = curses_gui.Row([curses_gui.Column('', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         curses_gui.Column('NAME', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         curses_gui.Column('YEAR', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         curses_gui.Column('RATING', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         curses_gui.Column('IMDB-TT', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         curses_gui.Column('FILE PATH', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
+                                         ])
+
+
+@functools.lru_cache(maxsize=256)
+def wrap_plot_text(plot: str, width: int) -> tuple:
+    return tuple(textwrap.wrap(plot, width=width)) or ('',)
+
+
 class VideoFileEditor:
-    def __init__(self, video_file: imdb_utils.VideoFile, imdb_search_results: List[imdb_utils.IMDBInfo] = None):
+    def __init__(self, video_file: imdb_utils.VideoFile, imdb_search_results: List[imdb_utils.IMDBInfo] = None,
+                 imdb_detail_prefetch_executor: concurrent.futures.Executor = None):
         self.video_file = video_file
         self.display_lines = list()
 
         self.imdb_search_results_start_row = 4
         self.imdb_search_results_end_row = -1
 
+        self.video_file_json_lines: Optional[List[str]] = None
+        self.video_file_json_dict: Optional[dict] = None
+
+        # Bumped whenever the search results are replaced or one of them has its details loaded
+        self.display_lines_cache_key: Optional[tuple] = None
+        self.imdb_search_results_version = 0
+        self.display_lines_selected_index: Optional[int] = None
+        self.format_search_result = None
+
         if imdb_search_results:
             self.imdb_search_results: List[Optional[imdb_utils.IMDBInfo]] = imdb_search_results
             self.imdb_search_results_selected_index = 0
@@ -34,6 +66,31 @@ class VideoFileEditor:
             self.imdb_search_results_selected_index = None
             self.hilighted_row = None
 
+        self.max_name_length = 0
+        self.max_tt_length = 0
+        self.update_search_result_column_widths()
+
+        self.imdb_detail_prefetch_executor = imdb_detail_prefetch_executor
+        self.imdb_detail_futures: Dict[str, concurrent.futures.Future] = dict()
+        self.prefetch_imdb_detail_info()
+
+    def prefetch_imdb_detail_info(self):
+        if not self.imdb_detail_prefetch_executor:
+            return
+
+        for imdb_info in self.imdb_search_results[:IMDB_DETAIL_PREFETCH_COUNT]:
+            if imdb_info.imdb_tt and not imdb_info.detail_loaded and imdb_info.imdb_tt not in self.imdb_detail_futures:
+                self.imdb_detail_futures[imdb_info.imdb_tt] = self.imdb_detail_prefetch_executor.submit(imdb_utils.get_parse_imdb_tt_info, imdb_info.imdb_tt)
+
+    def cancel_imdb_detail_prefetch(self):
+        for imdb_detail_future in self.imdb_detail_futures.values():
+            imdb_detail_future.cancel()
+        self.imdb_detail_futures.clear()
+
+    def update_search_result_column_widths(self):
+        self.max_name_length = min(max(map(len, (imdb_info.imdb_name for imdb_info in self.imdb_search_results)), default=0), 75)
+        self.max_tt_length = max(map(len, (imdb_info.imdb_tt for imdb_info in self.imdb_search_results)), default=0)
+
     def perform_edit_action(self, row_index: int):
         self.hilighted_row = None
 
@@ -45,18 +102,21 @@ class VideoFileEditor:
                 logging.info('User cancelled IMDB search/detail fetch')
 
         elif row_index == 2:
-            video_json = dataclasses.asdict(self.video_file)
+            video_json = imdb_utils.video_file_to_dict(self.video_file)
             if 'is_dirty' in video_json:
                 del video_json['is_dirty']
             video_json = curses_gui.tui_edit_json(video_json, max_width=128)
-            self.video_file.__dict__.update(video_json)
+            # Anything added in the editor that is not a VideoFile field is dropped
+            for field_name in imdb_utils.VIDEO_FILE_FIELD_NAMES:
+                if field_name in video_json:
+                    setattr(self.video_file, field_name, video_json[field_name])
             self.video_file.is_dirty = True
+            self.display_lines_cache_key = None
 
         elif self.imdb_search_results and self.imdb_search_results_start_row <= row_index < self.imdb_search_results_end_row:
             current_imdb_selected_detail_index = self.imdb_search_results_selected_index
             new_imdb_selected_detail_index = row_index - self.imdb_search_results_start_row
             new_imdb_search_result = self.imdb_search_results[new_imdb_selected_detail_index]
-            new_imdb_search_result_is_loaded = new_imdb_search_result.imdb_year or new_imdb_search_result.imdb_rating or new_imdb_search_result.imdb_genres or new_imdb_search_result.imdb_plot
 
             if new_imdb_selected_detail_index == current_imdb_selected_detail_index:
                 imdb_info = self.imdb_search_results[self.imdb_search_results_selected_index]
@@ -68,7 +128,7 @@ class VideoFileEditor:
                 self.video_file.imdb_plot = imdb_info.imdb_plot
                 self.video_file.is_dirty = True
 
-            elif new_imdb_search_result_is_loaded:
+            elif new_imdb_search_result.detail_loaded:
                 self.imdb_search_results_selected_index = new_imdb_selected_detail_index
             else:
                 try:
@@ -77,25 +137,47 @@ class VideoFileEditor:
                 except curses_gui.UserCancelException:
                     logging.info('User cancelled IMDB search/detail fetch')
 
-    def load_imdb_search_info(self, file_name: str, file_year=''):
-        dialog_msg = f'Fetching IMDB Search Info for "{file_name}"'
-        imdb_search_task = functools.partial(imdb_utils.get_parse_imdb_search_results, file_name, file_year)
-        if not (imdb_search_results := curses_gui.run_cancellable_thread_dialog(imdb_search_task, dialog_msg)):
-            with curses_gui.DialogBox(prompt=[f'No search results for "{file_name}"'], buttons_text=['OK']) as dialog_box:
+    @staticmethod
+    def fetch_imdb_info(cached_result, imdb_fetch_task: Callable, dialog_msg: str, no_result_msg: str):
+        if not (imdb_result := cached_result):
+            imdb_result = curses_gui.run_cancellable_thread_dialog(imdb_fetch_task, dialog_msg)
+
+        if not imdb_result:
+            with curses_gui.DialogBox(prompt=[no_result_msg], buttons_text=['OK']) as dialog_box:
                 dialog_box.run()
-        else:
+
+        return imdb_result
+
+    def load_imdb_search_info(self, file_name: str, file_year=''):
+        imdb_search_task = functools.partial(imdb_utils.fetch_parse_imdb_search_results, file_name, file_year)
+        imdb_search_results = self.fetch_imdb_info(imdb_utils.get_cached_imdb_search_results(file_name, file_year), imdb_search_task,
+                                                   f'Fetching IMDB Search Info for "{file_name}"', f'No search results for "{file_name}"')
+        if imdb_search_results:
             self.imdb_search_results = imdb_search_results
+            self.imdb_search_results_version += 1
+            self.update_search_result_column_widths()
+            self.prefetch_imdb_detail_info()
 
     def load_imdb_detail_info(self, imdb_info_index: int):
         imdb_info = self.imdb_search_results[imdb_info_index]
 
-        dialog_msg = f'Fetching IMDB Detail Info for "{imdb_info.imdb_name}"'
-        imdb_details_task = functools.partial(imdb_utils.get_parse_imdb_tt_info, imdb_info.imdb_tt)
-        if not (imdb_detail_result := curses_gui.run_cancellable_thread_dialog(imdb_details_task, dialog_msg)):
-            with curses_gui.DialogBox(prompt=[f'No detail results for "{imdb_info.imdb_name}"'], buttons_text=['OK']) as dialog_box:
-                dialog_box.run()
-        else:
+        cached_imdb_info = None
+        imdb_details_task = None
+        # A prefetch that has not started yet is cancelled and the details are fetched now instead
+        if imdb_detail_future := self.imdb_detail_futures.pop(imdb_info.imdb_tt, None):
+            if not imdb_detail_future.done() and not imdb_detail_future.cancel():
+                imdb_details_task = imdb_detail_future.result
+            elif not imdb_detail_future.cancelled() and not imdb_detail_future.exception():
+                cached_imdb_info = imdb_detail_future.result()
+        if not (cached_imdb_info or imdb_details_task):
+            cached_imdb_info = imdb_utils.get_cached_imdb_tt_info(imdb_info.imdb_tt)
+            imdb_details_task = functools.partial(imdb_utils.fetch_parse_imdb_tt_info, imdb_info.imdb_tt)
+        imdb_detail_result = self.fetch_imdb_info(cached_imdb_info, imdb_details_task,
+                                                  f'Fetching IMDB Detail Info for "{imdb_info.imdb_name}"', f'No detail results for "{imdb_info.imdb_name}"')
+        if imdb_detail_result:
             self.imdb_search_results[imdb_info_index] = imdb_detail_result
+            self.imdb_search_results_version += 1
+            self.update_search_result_column_widths()
 
     def do_imdb_search_and_load_detail(self, file_name: str, file_year='', ask_for_name=False):
         if ask_for_name:
@@ -114,7 +196,20 @@ class VideoFileEditor:
             self.imdb_search_results_selected_index = 0
             self.hilighted_row = self.imdb_search_results_start_row
 
+    def format_search_result_line(self, imdb_info_index: int) -> str:
+        imdb_info = self.imdb_search_results[imdb_info_index]
+        prefix = '=> ' if imdb_info_index == self.imdb_search_results_selected_index else '   '
+        return self.format_search_result(prefix, imdb_info.imdb_tt, imdb_info.imdb_name, imdb_info.imdb_year, imdb_info.imdb_rating, imdb_info.imdb_plot)
+
     def setup_display_lines(self, panel_width: int, panel_height: int) -> List:
+        display_lines_cache_key = (panel_width, self.imdb_search_results_version)
+        if display_lines_cache_key == self.display_lines_cache_key and self.display_lines_selected_index is not None and self.imdb_search_results_selected_index is not None:
+            if self.imdb_search_results_selected_index != self.display_lines_selected_index:
+                self.update_selected_search_result_lines(panel_width)
+            return self.display_lines
+        self.display_lines_cache_key = display_lines_cache_key
+        self.display_lines_selected_index = self.imdb_search_results_selected_index
+
         self.display_lines = list()
 
         if self.video_file.scrubbed_file_year:
@@ -125,28 +220,37 @@ class VideoFileEditor:
         self.display_lines.append(f'Search IMDB for other target')
         self.display_lines.append(f'Edit video record')
 
-        self.display_lines.append(curses_gui.HorizontalLine())
+        self.display_lines.append(HORIZONTAL_LINE)
 
         if self.imdb_search_results:
-            max_name_length = 0
-            max_tt_length = 0
-            for i in range(len(self.imdb_search_results)):
-                imdb_info = self.imdb_search_results[i]
-                max_name_length = max(max_name_length, len(imdb_info.imdb_name))
-                max_tt_length = max(max_tt_length, len(imdb_info.imdb_tt))
-            max_name_length = min(max_name_length, 75)
+            max_name_length = self.max_name_length
+            max_tt_length = self.max_tt_length
+
+            self.format_search_result = f'{{}}{{:{max_tt_length}}} {{: <{max_name_length}.{max_name_length}}}  [{{: <4.4}}] [{{: <3}}] {{}}'.format
 
             self.imdb_search_results_start_row = len(self.display_lines)
-            for i in range(len(self.imdb_search_results)):
-                imdb_info = self.imdb_search_results[i]
-                if i == self.imdb_search_results_selected_index:
-                    self.display_lines.append(f'=> {imdb_info.imdb_tt:{max_tt_length}} {imdb_info.imdb_name[:max_name_length]: <{max_name_length}}  [{imdb_info.imdb_year[:4]: <4}] [{imdb_info.imdb_rating: <3}] {imdb_info.imdb_plot}')
-                else:
-                    self.display_lines.append(f'   {imdb_info.imdb_tt:{max_tt_length}} {imdb_info.imdb_name[:max_name_length]: <{max_name_length}}  [{imdb_info.imdb_year[:4]: <4}] [{imdb_info.imdb_rating: <3}] {imdb_info.imdb_plot}')
+            self.display_lines.extend([self.format_search_result_line(i) for i in range(len(self.imdb_search_results))])
             self.imdb_search_results_end_row = len(self.display_lines)
 
-            self.display_lines.append(curses_gui.HorizontalLine())
+            self.display_lines.append(HORIZONTAL_LINE)
+
+        self.append_video_info_lines(panel_width)
+
+        return self.display_lines
+
+    def update_selected_search_result_lines(self, panel_width: int):
+        # Build a new list rather than patching in place, so the caller can still tell that the lines have changed
+        old_selected_index = self.display_lines_selected_index
+        new_selected_index = self.imdb_search_results_selected_index
+        self.display_lines_selected_index = new_selected_index
+
+        self.display_lines = self.display_lines[:self.imdb_search_results_end_row + 1]
+        self.display_lines[self.imdb_search_results_start_row + old_selected_index] = self.format_search_result_line(old_selected_index)
+        self.display_lines[self.imdb_search_results_start_row + new_selected_index] = self.format_search_result_line(new_selected_index)
 
+        self.append_video_info_lines(panel_width)
+
+    def append_video_info_lines(self, panel_width: int):
         if self.imdb_search_results_selected_index is not None and self.imdb_search_results[self.imdb_search_results_selected_index].imdb_name:
             imdb_info = self.imdb_search_results[self.imdb_search_results_selected_index]
 
@@ -157,40 +261,52 @@ class VideoFileEditor:
             self.display_lines.append(f'imdb_genres: {imdb_info.imdb_genres}')
 
             wrap_width = min(panel_width - 20, 100)
-            plot_lines = textwrap.wrap(imdb_info.imdb_plot, width=wrap_width) or ['']
+            plot_lines = wrap_plot_text(imdb_info.imdb_plot, wrap_width)
             self.display_lines.append(f'')
             self.display_lines.append(f'imdb_plot:   {plot_lines[0]}')
             for plot_line in plot_lines[1:]:
                 self.display_lines.append(f'             {plot_line}')
 
         else:
-            json_str = json.dumps(dataclasses.asdict(self.video_file), indent=4, sort_keys=True)
-            json_str_lines = json_str.splitlines()
-            self.display_lines.extend(json_str_lines)
+            video_file_dict = imdb_utils.video_file_to_dict(self.video_file)
+            if video_file_dict != self.video_file_json_dict:
+                json_str = json.dumps(video_file_dict, indent=4, sort_keys=True)
+                self.video_file_json_lines = json_str.splitlines()
+                self.video_file_json_dict = video_file_dict
+            self.display_lines.extend(self.video_file_json_lines)
 
-        return self.display_lines
 
-
-def edit_individual_video_file(video_file: imdb_utils.VideoFile, imdb_search_results: List[imdb_utils.IMDBInfo] = None):
+def edit_individual_video_file(video_file: imdb_utils.VideoFile, imdb_search_results: List[imdb_utils.IMDBInfo] = None,
+                               imdb_detail_prefetch_executor: concurrent.futures.Executor = None):
     video_file.is_dirty = False
-    video_file_editor = VideoFileEditor(video_file, imdb_search_results)
+    video_file_editor = VideoFileEditor(video_file, imdb_search_results, imdb_detail_prefetch_executor)
+
+    with curses_gui.ScrollingPanel(rows=[''], height=0.75, width=0.75, hilighted_row_index=video_file_editor.hilighted_row, show_immediately=False) as video_panel:
+        last_display_lines = None
 
-    with curses_gui.ScrollingPanel(rows=[''], height=0.75, width=0.75, hilighted_row_index=video_file_editor.hilighted_row) as video_panel:
-        while True:
-            panel_width, panel_height = video_panel.get_width_height()
-            video_file_editor.setup_display_lines(panel_width, panel_height)
-            video_panel.set_rows(video_file_editor.display_lines, hilighted_row=video_file_editor.hilighted_row)
-            video_panel.show()
+        try:
+            while True:
+                panel_width, panel_height = video_panel.get_width_height()
+                video_file_editor.setup_display_lines(panel_width, panel_height)
 
-            run_result = video_panel.run()
+                if video_file_editor.display_lines != last_display_lines:
+                    video_panel.set_rows(video_file_editor.display_lines, hilighted_row=video_file_editor.hilighted_row)
+                    last_display_lines = video_file_editor.display_lines
+                elif video_file_editor.hilighted_row is not None:
+                    video_panel.set_hilighted_row(video_file_editor.hilighted_row)
+                video_panel.show()
 
-            if run_result.key == curses_gui.Keycodes.ESCAPE:
-                raise curses_gui.UserCancelException()
-            else:
-                video_file_editor.perform_edit_action(run_result.row_index)
+                run_result = video_panel.run()
+
+                if run_result.key == curses_gui.Keycodes.ESCAPE:
+                    raise curses_gui.UserCancelException()
+                else:
+                    video_file_editor.perform_edit_action(run_result.row_index)
 
-                if video_file.is_dirty:
-                    return video_file
+                    if video_file.is_dirty:
+                        return video_file
+        finally:
+            video_file_editor.cancel_imdb_detail_prefetch()
 
 
 class MyMenu(curses_gui.MainMenu):
@@ -203,22 +319,24 @@ class MyMenu(curses_gui.MainMenu):
         self.logger = logging.getLogger()
 
     def set_menu_choices(self):
-        self.menu_choices = []
-        self.menu_choices.append(('Load Video Info', self.load_video_file_data))
-        self.menu_choices.append(('Save Video Info', self.save_video_file_data))
-        self.menu_choices.append(('Display Video Info', self.display_all_video_file_data))
-        self.menu_choices.append(('Scan Video Folder', self.scan_video_folder))
-        self.menu_choices.append(('Update Video Info', self.update_all_video_file_data))
-
-        # self.menu_choices.append((curses_gui.HorizontalLine(), None))
-        # self.menu_choices.append(('test_message_panel', self.test_message_panel))
-
-        # self.menu_choices.append((curses_gui.HorizontalLine(), None))
-        # self.menu_choices.append(('test_scrolling_panel_grid_mode', self.test_scrolling_panel))
-        # self.menu_choices.append(('test_scrolling_panel_select_grid_cells', self.test_scrolling_panel_select_grid_cells))
-        # self.menu_choices.append(('test_scrolling_panel_100_rows', self.test_scrolling_panel_100_rows))
-        # self.menu_choices.append(('test_scrolling_panel_width', self.test_scrolling_panel_width))
-        # self.menu_choices.append(('test_scrolling_panel_width_height', self.test_scrolling_panel_width_height))
+        self.menu_choices = [
+            ('Load Video Info', self.load_video_file_data),
+            ('Save Video Info', self.save_video_file_data),
+            ('Display Video Info', self.display_all_video_file_data),
+            ('Scan Video Folder', self.scan_video_folder),
+            ('Update Video Info', self.update_all_video_file_data),
+            ('Clear IMDB Cache', self.clear_imdb_cache),
+
+            # (curses_gui.HorizontalLine(), None),
+            # ('test_message_panel', self.test_message_panel),
+
+            # (curses_gui.HorizontalLine(), None),
+            # ('test_scrolling_panel_grid_mode', self.test_scrolling_panel),
+            # ('test_scrolling_panel_select_grid_cells', self.test_scrolling_panel_select_grid_cells),
+            # ('test_scrolling_panel_100_rows', self.test_scrolling_panel_100_rows),
+            # ('test_scrolling_panel_width', self.test_scrolling_panel_width),
+            # ('test_scrolling_panel_width_height', self.test_scrolling_panel_width_height),
+        ]
 
     def quit_confirm(self):
         if self.video_files_is_dirty:
@@ -295,15 +413,10 @@ class MyMenu(curses_gui.MainMenu):
     #     import random
     #     import string
     #
+    #     charset = string.ascii_uppercase + string.ascii_lowercase + string.digits + '      '
     #     display_lines = list()
     #     for row_i in range(100):
-    #         text_list = list()
-    #         for col_i in range(2):
-    #             text_len = random.randint(5, 15)
-    #             text = ''
-    #             for text_i in range(text_len):
-    #                 text += random.choice(string.ascii_uppercase + string.ascii_lowercase + string.digits + '      ')
-    #             text_list.append(text)
+    #         text_list = [''.join(random.choices(charset, k=random.randint(5, 15))) for col_i in range(2)]
     #         display_lines.append(text_list)
     #     header_columns = list()
     #     header_columns.append(curses_gui.Column('Header Column 1', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK))
@@ -318,29 +431,19 @@ class MyMenu(curses_gui.MainMenu):
                 dialog_box.run()
             return
 
-        header_columns = [curses_gui.Column('', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          curses_gui.Column('NAME', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          curses_gui.Column('YEAR', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          curses_gui.Column('RATING', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          curses_gui.Column('IMDB-TT', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          curses_gui.Column('FILE PATH', colour=curses_gui.CursesColourBinding.COLOUR_CYAN_BLACK),
-                          ]
-        header_row = curses_gui.Row(header_columns)
+        num_digits = len(str(len(self.video_files)))
+        format_index = f'[{{:0{num_digits}d}}]'.format
 
-        with curses_gui.ScrollingPanel(rows=[''], header_row=header_row, inner_padding=True, show_immediately=False) as scrolling_panel:
+        def make_display_row(i: int, video_file: imdb_utils.VideoFile) -> curses_gui.Row:
+            if video_file.imdb_tt:
+                return curses_gui.Row([format_index(i), video_file.imdb_name, video_file.imdb_year, f'{video_file.imdb_rating}', f'[{video_file.imdb_tt}]', video_file.file_path])
+            else:
+                return curses_gui.Row([format_index(i), video_file.scrubbed_file_name, video_file.scrubbed_file_year, '', '', video_file.file_path])
+
+        display_rows = [make_display_row(i, video_file) for i, video_file in enumerate(self.video_files)]
+
+        with curses_gui.ScrollingPanel(rows=display_rows, header_row=VIDEO_FILES_HEADER_ROW, inner_padding=True, show_immediately=False) as scrolling_panel:
             while True:
-                num_video_files = len(self.video_files)
-                num_digits = math.floor(math.log10(num_video_files)) + 1
-                display_rows = []
-                for i, video_file in enumerate(self.video_files):
-                    if video_file.imdb_tt:
-                        display_rows.append(curses_gui.Row([f'[{i:0{num_digits}d}]', video_file.imdb_name, video_file.imdb_year, f'{video_file.imdb_rating}', f'[{video_file.imdb_tt}]', video_file.file_path]))
-                    else:
-                        display_rows.append(curses_gui.Row([f'[{i:0{num_digits}d}]', video_file.scrubbed_file_name, video_file.scrubbed_file_year, '', '', video_file.file_path]))
-                hilited_row_index = scrolling_panel.hilighted_row_index
-                top_visible_row_index = scrolling_panel.top_visible_row_index
-                scrolling_panel.set_rows(display_rows)
-                scrolling_panel.set_hilighted_row(hilited_row_index, top_visible_row_index)
                 scrolling_panel.show()
 
                 run_result = scrolling_panel.run()
@@ -354,6 +457,12 @@ class MyMenu(curses_gui.MainMenu):
                         edit_individual_video_file(selected_video_file)
                         if selected_video_file.is_dirty:
                             self.video_files_is_dirty = True
+
+                            display_rows[run_result.row_index] = make_display_row(run_result.row_index, selected_video_file)
+                            hilited_row_index = scrolling_panel.hilighted_row_index
+                            top_visible_row_index = scrolling_panel.top_visible_row_index
+                            scrolling_panel.set_rows(display_rows)
+                            scrolling_panel.set_hilighted_row(hilited_row_index, top_visible_row_index)
                     except curses_gui.UserCancelException:
                         logging.info('User cancelled video file edit')
 
@@ -370,10 +479,7 @@ class MyMenu(curses_gui.MainMenu):
         input_panel.hide()
 
         if video_file_path:
-            with open(video_file_path, 'w') as f:
-                json_list = [dataclasses.asdict(video_file) for video_file in self.video_files]
-                json_str = json.dumps(json_list, indent=4)
-                f.write(json_str)
+            imdb_utils.save_video_files(video_file_path, self.video_files)
             final_message = f'Video saved to "{video_file_path}"'
             self.video_files_is_dirty = False
 
@@ -388,16 +494,10 @@ class MyMenu(curses_gui.MainMenu):
 
         self.video_file_path = video_file_path
 
-        with open(self.video_file_path, encoding='utf8') as f:
-            video_files_json = json.load(f)
+        self.video_files = imdb_utils.load_video_files(self.video_file_path)
 
         self.video_files_is_dirty = False
 
-        self.video_files = list()
-        for video_file_dict in video_files_json:
-            video_file = imdb_utils.VideoFile(**video_file_dict)
-            self.video_files.append(video_file)
-
         num_video_files = len(self.video_files)
         with curses_gui.DialogBox(prompt=[f'Loaded {num_video_files} video files from "{self.video_file_path}"'], buttons_text=['OK']) as dialog_box:
             dialog_box.run()
@@ -421,6 +521,13 @@ class MyMenu(curses_gui.MainMenu):
 
         self.display_all_video_file_data()
 
+    @staticmethod
+    def clear_imdb_cache():
+        imdb_utils.IMDB_CACHE.clear()
+
+        with curses_gui.DialogBox(prompt=['IMDB cache cleared'], buttons_text=['OK']) as dialog_box:
+            dialog_box.run()
+
     def update_all_video_file_data(self):
         def progress_callback():
             nonlocal progress_indicator
@@ -436,38 +543,75 @@ class MyMenu(curses_gui.MainMenu):
         num_video_files = len(unprocessed_video_files)
         num_video_files_processed = 0
 
-        with curses_gui.MessagePanel(['Beginning processing of video files...'], height=0.25, width=0.25) as message_panel:
-            for i, video_file in enumerate(unprocessed_video_files):
-                progress_message = f'Processing {video_file.scrubbed_file_name} [{i}/{num_video_files}]'
-                message_panel.append_message_lines(progress_message, trim_to_visible_window=True)
+        search_executor = curses_gui.DaemonThreadPoolExecutor(max_workers=IMDB_PREFETCH_COUNT, thread_name_prefix='imdb_search')
+        detail_prefetch_executor = curses_gui.DaemonThreadPoolExecutor(max_workers=1, thread_name_prefix='imdb_detail')
+        search_futures: Dict[int, concurrent.futures.Future] = dict()
 
+        def search_and_prefetch_detail(file_name: str, file_year: str) -> List[imdb_utils.IMDBInfo]:
+            search_results = imdb_utils.get_parse_imdb_search_results(file_name, file_year)
+            if search_results and search_results[0].imdb_tt:
                 try:
-                    progress_indicator = '.'
-                    progress_message = f'Searching IMDB for {video_file.scrubbed_file_name} [{i}/{num_video_files}]'
-                    message_panel.append_message_lines(progress_message, trim_to_visible_window=True)
-                    imdb_search_results = curses_gui.run_cancellable_thread(functools.partial(imdb_utils.get_parse_imdb_search_results, video_file.scrubbed_file_name, video_file.scrubbed_file_year), getch_function=message_panel.window.getch, progress_callback=(progress_callback, 0.25))
-                    message_panel.append_message_lines(f'Found IMDB {len(imdb_search_results)} results for {video_file.scrubbed_file_name} [{i}/{num_video_files}]', trim_to_visible_window=True)
-
-                    if imdb_search_results and imdb_search_results[0].imdb_tt:
-                        imdb_tt = imdb_search_results[0].imdb_tt
+                    imdb_utils.get_parse_imdb_tt_info(search_results[0].imdb_tt)
+                except Exception:
+                    logging.exception('Failed to prefetch IMDB details for %s', search_results[0].imdb_tt)
+            return search_results
+
+        def prefetch_search_results(start_index: int):
+            for j in range(start_index, min(start_index + IMDB_PREFETCH_COUNT, num_video_files)):
+                if j not in search_futures:
+                    prefetch_video_file = unprocessed_video_files[j]
+                    search_futures[j] = search_executor.submit(search_and_prefetch_detail, prefetch_video_file.scrubbed_file_name, prefetch_video_file.scrubbed_file_year)
+
+        try:
+            with curses_gui.MessagePanel(['Beginning processing of video files...'], height=0.25, width=0.25) as message_panel:
+                pending_message_lines = list()
+                queue_message_line = pending_message_lines.append
+
+                def flush_message_lines():
+                    if pending_message_lines:
+                        message_panel.append_message_lines(pending_message_lines, trim_to_visible_window=True)
+                        pending_message_lines.clear()
+
+                for i, video_file in enumerate(unprocessed_video_files):
+                    progress_message = f'Processing {video_file.scrubbed_file_name} [{i}/{num_video_files}]'
+                    queue_message_line(progress_message)
+
+                    try:
                         progress_indicator = '.'
-                        progress_message = f'Fetching IMDB details for {imdb_tt} [{i}/{num_video_files}]'
-                        message_panel.append_message_lines(progress_message, trim_to_visible_window=True)
-                        imdb_search_results[0] = curses_gui.run_cancellable_thread(functools.partial(imdb_utils.get_parse_imdb_tt_info, imdb_tt), getch_function=message_panel.window.getch, progress_callback=(progress_callback, 0.25))
-                        message_panel.append_message_lines(f'Fetched IMDB details for {imdb_tt} [{i}/{num_video_files}]', trim_to_visible_window=True)
+                        progress_message = f'Searching IMDB for {video_file.scrubbed_file_name} [{i}/{num_video_files}]'
+                        queue_message_line(progress_message)
+                        prefetch_search_results(i)
+                        flush_message_lines()
+                        imdb_search_results = curses_gui.run_cancellable_thread(search_futures.pop(i).result, getch_function=message_panel.window.getch, progress_callback=(progress_callback, 0.25))
+                        queue_message_line(f'Found IMDB {len(imdb_search_results)} results for {video_file.scrubbed_file_name} [{i}/{num_video_files}]')
 
-                    edit_individual_video_file(video_file, imdb_search_results=imdb_search_results)
+                        if imdb_search_results and imdb_search_results[0].imdb_tt:
+                            imdb_tt = imdb_search_results[0].imdb_tt
+                            progress_indicator = '.'
+                            progress_message = f'Fetching IMDB details for {imdb_tt} [{i}/{num_video_files}]'
+                            queue_message_line(progress_message)
+                            flush_message_lines()
+                            imdb_search_results[0] = curses_gui.run_cancellable_thread(functools.partial(imdb_utils.get_parse_imdb_tt_info, imdb_tt), getch_function=message_panel.window.getch, progress_callback=(progress_callback, 0.25))
+                            queue_message_line(f'Fetched IMDB details for {imdb_tt} [{i}/{num_video_files}]')
 
-                    self.video_files_is_dirty = video_file.is_dirty or self.video_files_is_dirty
+                        flush_message_lines()
+                        edit_individual_video_file(video_file, imdb_search_results=imdb_search_results, imdb_detail_prefetch_executor=detail_prefetch_executor)
 
-                    num_video_files_processed += 1
+                        self.video_files_is_dirty = video_file.is_dirty or self.video_files_is_dirty
 
-                except curses_gui.UserCancelException:
-                    with curses_gui.DialogBox(prompt=['Continue processing or Cancel?'], buttons_text=['Continue', 'Cancel']) as dialog_box:
-                        if dialog_box.run() == 'Cancel':
-                            break
+                        num_video_files_processed += 1
+
+                    except curses_gui.UserCancelException:
+                        with curses_gui.DialogBox(prompt=['Continue processing or Cancel?'], buttons_text=['Continue', 'Cancel']) as dialog_box:
+                            if dialog_box.run() == 'Cancel':
+                                break
+
+                    queue_message_line(HORIZONTAL_LINE)
 
-                message_panel.append_message_lines(curses_gui.HorizontalLine())
+        finally:
+            search_executor.shutdown(wait=False, cancel_futures=True)
+            detail_prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            logging.info('IMDB cache: %d hits, %d misses', imdb_utils.IMDB_CACHE.num_hits, imdb_utils.IMDB_CACHE.num_misses)
 
         with curses_gui.DialogBox(prompt=[f'Processed {num_video_files_processed} video files']) as dialog_box:
             dialog_box.run()
@@ -0,0 +1,39 @@
+import threading
+import unittest
+
+from imdb_scraper import curses_gui
+
+
+class DaemonThreadPoolExecutorTest(unittest.TestCase):
+    def test_results_and_exceptions(self):
+        executor = curses_gui.DaemonThreadPoolExecutor(max_workers=2)
+        self.assertEqual(executor.submit(pow, 2, 10).result(timeout=5), 1024)
+        with self.assertRaises(ZeroDivisionError):
+            executor.submit(divmod, 1, 0).result(timeout=5)
+        executor.shutdown()
+
+    def test_workers_are_bounded_daemons(self):
+        executor = curses_gui.DaemonThreadPoolExecutor(max_workers=2)
+        release = threading.Event()
+        futures = [executor.submit(release.wait) for _ in range(5)]
+        self.assertEqual(len(executor.workers), 2)
+        self.assertTrue(all(worker.daemon for worker in executor.workers))
+        release.set()
+        self.assertTrue(all(future.result(timeout=5) for future in futures))
+        executor.shutdown()
+
+    def test_shutdown_cancels_queued_tasks(self):
+        executor = curses_gui.DaemonThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        running_future = executor.submit(release.wait)
+        queued_future = executor.submit(release.wait)
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.assertTrue(queued_future.cancelled())
+        release.set()
+        self.assertTrue(running_future.result(timeout=5))
+        with self.assertRaises(RuntimeError):
+            executor.submit(release.wait)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import dataclasses
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from imdb_scraper import imdb_utils
+
+
+class CleanIMDBYearTest(unittest.TestCase):
+    def test_clean_imdb_year(self):
+        self.assertEqual(imdb_utils.clean_imdb_year('2019'), '2019')
+        self.assertEqual(imdb_utils.clean_imdb_year('2019–2021'), '2019')
+        self.assertEqual(imdb_utils.clean_imdb_year('2019 TV Series'), '2019')
+        self.assertEqual(imdb_utils.clean_imdb_year('201'), '')
+        self.assertEqual(imdb_utils.clean_imdb_year('TV Series'), '')
+        self.assertEqual(imdb_utils.clean_imdb_year('٢٠١٩'), '')
+        self.assertEqual(imdb_utils.clean_imdb_year(''), '')
+        self.assertEqual(imdb_utils.clean_imdb_year(None), '')
+
+
+class IMDBTTFromURLTest(unittest.TestCase):
+    def test_imdb_tt_from_url(self):
+        self.assertEqual(imdb_utils.imdb_tt_from_url('/title/tt0211915/?ref_=fn_al_tt_1'), 'tt0211915')
+        self.assertEqual(imdb_utils.imdb_tt_from_url('/title/tt0211915?ref_=fn_al_tt_1'), 'tt0211915')
+        self.assertEqual(imdb_utils.imdb_tt_from_url('/title/tt0211915'), 'tt0211915')
+        self.assertEqual(imdb_utils.imdb_tt_from_url('/title/tt/'), '')
+        self.assertEqual(imdb_utils.imdb_tt_from_url('/name/nm0000123/'), '')
+        self.assertEqual(imdb_utils.imdb_tt_from_url(''), '')
+
+
+class IMDBCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'imdb_cache')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_get(self):
+        imdb_cache = imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60)
+        self.assertIsNone(imdb_cache.get('detail:tt1'))
+        imdb_cache.put('detail:tt1', imdb_utils.IMDBInfo(imdb_tt='tt1', imdb_name='One'))
+        self.assertEqual(imdb_cache.get('detail:tt1').imdb_name, 'One')
+        self.assertEqual((imdb_cache.num_hits, imdb_cache.num_misses), (1, 1))
+
+    def test_entries_persist_on_disk(self):
+        imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60).put('detail:tt1', imdb_utils.IMDBInfo(imdb_tt='tt1', imdb_name='One'))
+        self.assertEqual(imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60).get('detail:tt1').imdb_name, 'One')
+
+    def test_expired_entries_are_missing(self):
+        imdb_cache = imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60)
+        with mock.patch('imdb_scraper.imdb_utils.time.time', return_value=1000.0):
+            imdb_cache.put('detail:tt1', imdb_utils.IMDBInfo(imdb_tt='tt1'))
+        with mock.patch('imdb_scraper.imdb_utils.time.time', return_value=1059.0):
+            self.assertIsNotNone(imdb_cache.get('detail:tt1'))
+        with mock.patch('imdb_scraper.imdb_utils.time.time', return_value=1061.0):
+            self.assertIsNone(imdb_cache.get('detail:tt1'))
+        self.assertNotIn('detail:tt1', imdb_cache.memory_cache)
+
+    def test_memory_cache_is_bounded(self):
+        imdb_cache = imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60, max_memory_entries=2)
+        for key in ('a', 'b', 'c'):
+            imdb_cache.put(key, key)
+        self.assertEqual(list(imdb_cache.memory_cache), ['b', 'c'])
+
+        # An entry dropped from memory is still read back from the shelf
+        self.assertEqual(imdb_cache.get('a'), 'a')
+        self.assertEqual(list(imdb_cache.memory_cache), ['c', 'a'])
+
+    def test_clear(self):
+        imdb_cache = imdb_utils.IMDBCache(self.cache_path, ttl_seconds=60)
+        imdb_cache.put('detail:tt1', imdb_utils.IMDBInfo(imdb_tt='tt1'))
+        imdb_cache.clear()
+        self.assertIsNone(imdb_cache.get('detail:tt1'))
+
+
+class SaveLoadVideoFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.video_file_path = os.path.join(self.temp_dir.name, 'imdb_video_info.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_save_matches_json_dumps(self, video_files):
+        imdb_utils.save_video_files(self.video_file_path, video_files)
+        with open(self.video_file_path, 'rb') as f:
+            saved_bytes = f.read()
+
+        self.assertEqual(saved_bytes, json.dumps([dataclasses.asdict(video_file) for video_file in video_files], indent=4).encode('utf8'))
+        self.assertEqual(imdb_utils.load_video_files(self.video_file_path), video_files)
+
+    def test_save_empty(self):
+        self.check_save_matches_json_dumps([])
+
+    def test_save_matches_json_dumps(self):
+        self.check_save_matches_json_dumps([imdb_utils.VideoFile(file_path='/videos/Amélie (2001).mkv', scrubbed_file_name='amélie', scrubbed_file_year='2001',
+                                                                 imdb_tt='tt0211915', imdb_name='Amélie', imdb_year='2001', imdb_rating='8.3',
+                                                                 imdb_genres=['Comedy', 'Romance'], imdb_plot='A "shy" waitress\ndecides to help.'),
+                                            imdb_utils.VideoFile(file_path='/videos/unknown.avi', imdb_genres=[]),
+                                            imdb_utils.VideoFile(file_path='/videos/edited.mp4', is_dirty=True)])
+
+    def test_unknown_and_missing_keys(self):
+        with open(self.video_file_path, 'w') as f:
+            json.dump([{'file_path': '/videos/a.mkv', 'imdb_tt': 'tt1', 'imdb_genres': ['Drama'], 'future_field': {'nested': 1}},
+                       {'file_path': '/videos/b.mkv'}], f)
+
+        video_files = imdb_utils.load_video_files(self.video_file_path)
+
+        self.assertEqual(video_files, [imdb_utils.VideoFile(file_path='/videos/a.mkv', imdb_tt='tt1', imdb_genres=['Drama']),
+                                       imdb_utils.VideoFile(file_path='/videos/b.mkv')])
+
+
+class IterFolderFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_file(self, *path_parts):
+        os.makedirs(os.path.join(self.root, *path_parts[:-1]), exist_ok=True)
+        with open(os.path.join(self.root, *path_parts), 'w'):
+            pass
+
+    def walk_file_paths(self):
+        return [os.path.join(folder_path, file_name) for folder_path, _, file_names in os.walk(self.root) for file_name in file_names]
+
+    def test_matches_os_walk(self):
+        self.make_file('b.mkv')
+        self.make_file('a', 'a1.mkv')
+        self.make_file('a', 'deeper', 'a2.avi')
+        self.make_file('c', 'c1.mp4')
+        self.make_file('a', 'a0.srt')
+        os.symlink(os.path.join(self.root, 'missing.mkv'), os.path.join(self.root, 'broken.mkv'))
+        os.symlink(os.path.join(self.root, 'c'), os.path.join(self.root, 'linked_folder'))
+
+        file_paths = [dir_entry.path for dir_entry in imdb_utils.iter_folder_files(self.root)]
+        self.assertEqual(file_paths, self.walk_file_paths())
+        self.assertIn(os.path.join(self.root, 'broken.mkv'), file_paths)
+
+    def test_deep_tree(self):
+        # Deeper than the recursion limit (os.makedirs and rmtree recurse too, so build and remove the tree by hand)
+        folder_paths = [self.root]
+        for _ in range(1200):
+            folder_paths.append(os.path.join(folder_paths[-1], 'd'))
+            os.mkdir(folder_paths[-1])
+        deep_file_path = os.path.join(folder_paths[-1], 'deep.mkv')
+        with open(deep_file_path, 'w'):
+            pass
+
+        try:
+            file_paths = [dir_entry.path for dir_entry in imdb_utils.iter_folder_files(self.root)]
+            self.assertEqual(file_paths, [deep_file_path])
+        finally:
+            os.remove(deep_file_path)
+            for folder_path in reversed(folder_paths[1:]):
+                os.rmdir(folder_path)
+
+    def test_missing_folder(self):
+        self.assertEqual(list(imdb_utils.iter_folder_files(os.path.join(self.root, 'missing'))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()